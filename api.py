@@ -5,7 +5,13 @@ Updated for NEW 2025 Foursquare Places API + Rate Limit Protection
 
 import os
 import requests
+import requests_cache
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
@@ -13,11 +19,77 @@ FSQ_SERVICE_KEY = os.getenv("FSQ_SERVICE_KEY")
 LOCATIONIQ_KEY = os.getenv("LOCATIONIQ_KEY")
 FSQ_VERSION = "2025-06-17"  # required version header
 
+# FSQ category ids matching scrape.USEFUL, so search only returns app-useful places
+CATEGORIES = ",".join([
+    "4bf58dd8d48988d1c4941735",  # Restaurant
+    "4bf58dd8d48988d16d941735",  # Café
+    "4bf58dd8d48988d16e941735",  # Fast Food Restaurant
+    "4bf58dd8d48988d116941735",  # Bar
+    "4bf58dd8d48988d11b941735",  # Pub
+    "4bf58dd8d48988d120951735",  # Food Court
+    "4bf58dd8d48988d17f941735",  # Movie Theater
+    "4bf58dd8d48988d137941735",  # Theater
+    "4bf58dd8d48988d1fd941735",  # Shopping Mall
+    "52f2ab2ebcbc57f1066b8b46",  # Supermarket
+    "4bf58dd8d48988d1f6941735",  # Department Store
+    "4bf58dd8d48988d163941735",  # Park
+    "4bf58dd8d48988d15a941735",  # Garden
+    "4bf58dd8d48988d165941735",  # Scenic Lookout
+    "4deefb944765f83613cdba6e",  # Historic and Protected Site
+    "4bf58dd8d48988d181941735",  # Museum
+])
+
+FSQ_HEADERS = {
+    "Authorization": f"Bearer {FSQ_SERVICE_KEY}",
+    "Accept": "application/json",
+    "X-Places-Api-Version": FSQ_VERSION
+}
+
+
+# ----------------------------------------------------
+# Shared HTTP session (keep-alive across all calls)
+# + on-disk response cache that survives restarts
+# ----------------------------------------------------
+def build_session():
+    """Fresh pooled + cached session; callers decide how long it lives."""
+    session = requests_cache.CachedSession(
+        "fsq_cache.sqlite",
+        expire_after=timedelta(hours=12),
+        urls_expire_after={
+            "places-api.foursquare.com/places/*/photos": timedelta(days=30),
+            "places-api.foursquare.com/places/search": 60,
+            "us1.locationiq.com/v1/search": timedelta(days=30),
+        },
+        allowable_codes=[200],
+        stale_if_error=True,
+        # keep API keys out of cache keys and the sqlite file
+        ignored_parameters=["Authorization", "key"]
+    )
+    session.headers.update({"User-Agent": "WeekendWish/1.0"})
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        # raise_on_status=False hands the final 429/5xx back to raise_for_status()
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
+    ))
+    return session
+
+
+@lru_cache(maxsize=1)
+def get_session():
+    """Process-wide default session, used when a helper gets session=None."""
+    return build_session()
+
 
 # ----------------------------------------------------
 # LocationIQ Geocoding
 # ----------------------------------------------------
-def geocode_address(address):
+def geocode_address(address, session=None):
     if not LOCATIONIQ_KEY:
         print("LocationIQ key missing!")
         return None, None
@@ -31,7 +103,7 @@ def geocode_address(address):
     }
 
     try:
-        r = requests.get(url, params=params, timeout=6)
+        r = (session or get_session()).get(url, params=params, timeout=6)
         r.raise_for_status()
         data = r.json()
         if not data:
@@ -42,33 +114,49 @@ def geocode_address(address):
         return None, None
 
 
+def geocode_addresses(addresses, max_workers=4, session=None):
+    """
+    Geocode several addresses; returns [(lat, lon), ...] in input order.
+    Duplicates are resolved once and lookups overlap on the pooled session
+    (small pool: LocationIQ rate-limits per second, Retry backs off on 429).
+    """
+    unique = list(dict.fromkeys(addresses))
+    if not unique:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as ex:
+        coords = dict(zip(unique, ex.map(lambda a: geocode_address(a, session), unique)))
+
+    return [coords[a] for a in addresses]
+
+
 # ----------------------------------------------------
 # Foursquare Search (NEW API, safe against 429)
 # ----------------------------------------------------
-def fsq_search_places(lat, lon, radius=8000, limit=10):
-    """Safe FSQ search with minimal fields + new API rules."""
+def fsq_search_places(lat, lon, radius=8000, limit=50, categories=CATEGORIES, session=None):
+    """
+    Safe FSQ search with minimal fields + new API rules.
+    One category-filtered, larger batch instead of several small searches.
+    """
     if not FSQ_SERVICE_KEY:
         raise RuntimeError("FSQ_SERVICE_KEY missing in .env")
 
     url = "https://places-api.foursquare.com/places/search"
 
-    headers = {
-        "Authorization": f"Bearer {FSQ_SERVICE_KEY}",
-        "Accept": "application/json",
-        "X-Places-Api-Version": FSQ_VERSION
-    }
-
     params = {
         "ll": f"{lat},{lon}",
         "radius": radius,
         "limit": limit,
+        "fsq_category_ids": categories,
 
         # ⭐ required to get name/categories/etc
         "fields": "fsq_place_id,name,categories,location,price,popularity"
     }
 
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=10)
+        resp = (session or get_session()).get(
+            url, headers=FSQ_HEADERS, params=params, timeout=10
+        )
         resp.raise_for_status()
         return resp.json().get("results", [])
     except requests.exceptions.HTTPError as e:
@@ -100,21 +188,15 @@ def safe_get_main_coords(place):
 # ----------------------------------------------------
 # Photo Fetching (NEW API)
 # ----------------------------------------------------
-def fsq_get_photo_url(fsq_place_id):
+def fsq_get_photo_url(fsq_place_id, session=None):
     if not FSQ_SERVICE_KEY:
         print("Missing FSQ SERVICE KEY")
         return None
 
     url = f"https://places-api.foursquare.com/places/{fsq_place_id}/photos"
 
-    headers = {
-        "Authorization": f"Bearer {FSQ_SERVICE_KEY}",
-        "Accept": "application/json",
-        "X-Places-Api-Version": FSQ_VERSION
-    }
-
     try:
-        r = requests.get(url, headers=headers, timeout=6)
+        r = (session or get_session()).get(url, headers=FSQ_HEADERS, timeout=6)
         if r.status_code != 200:
             return None
 
@@ -132,7 +214,19 @@ def fsq_get_photo_url(fsq_place_id):
 # ----------------------------------------------------
 # Photo fetcher for top N places
 # ----------------------------------------------------
-def fetch_photos_for_top_places(places, top_n=8):
-    for p in places[:top_n]:
-        pid = p.get("fsq_place_id")
-        p["photo_url"] = fsq_get_photo_url(pid)
+def fetch_photos_for_top_places(places, top_n=8, fetch=fsq_get_photo_url):
+    """
+    Fetch photos concurrently; each call is blocking I/O on the shared session.
+    fetch: photo lookup to use per id (e.g. a cached wrapper from the UI layer)
+    """
+    # only places still missing a photo, one request per distinct id
+    pending = [p for p in places[:top_n] if not p.get("photo_url")]
+    ids = list(dict.fromkeys(p.get("fsq_place_id") for p in pending))
+    if not ids:
+        return
+
+    with ThreadPoolExecutor(max_workers=len(ids)) as ex:
+        urls = dict(zip(ids, ex.map(fetch, ids)))
+
+    for p in pending:
+        p["photo_url"] = urls[p.get("fsq_place_id")]
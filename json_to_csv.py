@@ -1,12 +1,42 @@
-import pandas as pd
-import json
+import csv
+import orjson
 
-# Load JSON
-with open("pune_clean.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
+SRC = "pune_clean.jsonl"
+DST = "pune_clean.csv"
 
-# Convert to DataFrame (automatically expands nested dictionaries)
-df = pd.json_normalize(data)
 
-# Save to CSV
-df.to_csv("pune_clean.csv", index=False, encoding="utf-8")
+def flatten(record, prefix=""):
+    """Expand nested dicts into dotted keys (same naming as pd.json_normalize)."""
+    flat = {}
+    nested = []
+    for k, v in record.items():
+        if isinstance(v, dict):
+            nested.append((k, v))
+        else:
+            flat[f"{prefix}{k}"] = v
+
+    # like json_normalize, nested columns come after the scalar ones
+    for k, v in nested:
+        flat.update(flatten(v, f"{prefix}{k}."))
+    return flat
+
+
+def iter_records(path):
+    # JSONL: one record per line, so only one is ever parsed at a time
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+# Pass 1: collect the union of columns (tags vary per POI), in first-seen order
+columns = {}
+for rec in iter_records(SRC):
+    columns.update(dict.fromkeys(flatten(rec)))
+
+# Pass 2: write rows; peak memory is one record + the column list
+with open(DST, "w", newline="", encoding="utf-8") as out:
+    writer = csv.DictWriter(out, fieldnames=list(columns), lineterminator="\n")
+    writer.writeheader()
+    for rec in iter_records(SRC):
+        writer.writerow(flatten(rec))
@@ -1,14 +1,16 @@
 import streamlit as st
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
 import os
 
 from api import (
+    build_session,
     geocode_address,
     fsq_search_places,
-    fetch_photos_for_top_places
+    fsq_get_photo_url
 )
 
-from planner import generate_itinerary_from_selected
+from planner import category_flags, generate_itinerary_from_selected
 
 load_dotenv()
 
@@ -34,9 +36,57 @@ st.title("🧭 WeekendWish — Smart Pune Day Planner")
 # -------------------------------------------------------
 # Caching (prevents repeated FSQ calls → stops 429)
 # -------------------------------------------------------
+# one pooled HTTP session shared by every rerun and session
+# (also reached from photo worker threads, hence no spinner)
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    return build_session()
+
+
 @st.cache_data(ttl=600)
 def cached_fsq_search(lat, lon):
-    return fsq_search_places(lat, lon, radius=8000, limit=10)
+    return fsq_search_places(lat, lon, radius=8000, limit=50, session=get_http_session())
+
+
+# The memoized lookups raise on a miss: st.cache_data never stores
+# exceptions, so a timeout / 429 / 5xx is retried next time instead of
+# being served from the cache for hours. The plain wrappers map it back
+# to the None result the rest of the app expects.
+@st.cache_data(ttl=24 * 3600)
+def _memo_geocode(addr):
+    lat, lon = geocode_address(addr, session=get_http_session())
+    if lat is None:
+        raise LookupError(f"geocoding failed: {addr}")
+    return lat, lon
+
+
+def cached_geocode(addr):
+    try:
+        return _memo_geocode(addr)
+    except LookupError:
+        return None, None
+
+
+# runs on photo worker threads, so no spinner (needs the script context)
+@st.cache_data(ttl=6 * 3600, show_spinner=False)
+def _memo_photo(pid):
+    url = fsq_get_photo_url(pid, session=get_http_session())
+    if url is None:
+        raise LookupError(f"no photo: {pid}")
+    return url
+
+
+def cached_photo(pid):
+    try:
+        return _memo_photo(pid)
+    except LookupError:
+        return None
+
+
+# background pool for photo prefetch, shared by every rerun and session
+@st.cache_resource(show_spinner=False)
+def get_photo_executor():
+    return ThreadPoolExecutor(max_workers=8)
 
 
 # -------------------------------------------------------
@@ -48,6 +98,59 @@ if "selected_places" not in st.session_state:
 if "last_search_results" not in st.session_state:
     st.session_state.last_search_results = []
 
+# (lat, lon) resolved in Step 2, reused by Step 4 instead of re-geocoding
+if "start_coords" not in st.session_state:
+    st.session_state.start_coords = None
+
+# fsq_place_id -> Future[photo_url] for photos still being prefetched
+if "photo_futures" not in st.session_state:
+    st.session_state.photo_futures = {}
+
+# Click results kept in state so any full rerun (e.g. the photo poller's)
+# renders them again instead of wiping them
+if "last_added" not in st.session_state:
+    st.session_state.last_added = None
+
+if "itinerary" not in st.session_state:
+    st.session_state.itinerary = None
+    st.session_state.ai_summary = None
+
+
+# -------------------------------------------------------
+# Photo Prefetch
+# -------------------------------------------------------
+def prefetch_photos(places, top_n=8):
+    """Start photo lookups in the background; cards render without waiting."""
+    executor = get_photo_executor()
+    ids = dict.fromkeys(p["fsq_place_id"] for p in places[:top_n])
+    st.session_state.photo_futures = {pid: executor.submit(cached_photo, pid) for pid in ids}
+
+
+def collect_prefetched_photos(places):
+    """Move finished prefetch results for `places` onto their dicts."""
+    futures = st.session_state.photo_futures
+    done = {}
+    for p in places:
+        pid = p["fsq_place_id"]
+        f = futures.get(pid)
+        if f is not None and f.done():
+            done[pid] = f.result()
+
+    for p in places:
+        if p["fsq_place_id"] in done:
+            p["photo_url"] = done[p["fsq_place_id"]]
+    for pid in done:
+        del futures[pid]
+
+
+# Only registered while photos are in flight. Once they have all landed it
+# does one full rerun to draw them; that run no longer registers the poller,
+# which stops its timer.
+@st.fragment(run_every=0.5)
+def photo_prefetch_poller():
+    if all(f.done() for f in st.session_state.photo_futures.values()):
+        st.rerun()
+
 
 # -------------------------------------------------------
 # Step 1 — User Inputs
@@ -74,12 +177,13 @@ if search_btn:
     if not address:
         st.error("Enter an address first.")
     else:
-        lat, lon = geocode_address(address)
+        lat, lon = cached_geocode(address)
 
         if lat is None:
             st.error("Couldn't find that address.")
         else:
             st.success("Location found!")
+            st.session_state.start_coords = (lat, lon)
 
             places_raw = cached_fsq_search(lat, lon)
 
@@ -92,10 +196,13 @@ if search_btn:
                 if plat is None:
                     continue
 
+                categories = [c.get("name", "") for c in p.get("categories", [])]
+
                 normalized.append({
                     "fsq_place_id": p.get("fsq_place_id"),
                     "name": p.get("name", "Unknown Place"),
-                    "categories": [c.get("name", "") for c in p.get("categories", [])],
+                    "categories": categories,
+                    "category_flags": category_flags(categories),
                     "lat": float(plat),
                     "lon": float(plon),
                     "price_tier": p.get("price"),
@@ -103,8 +210,10 @@ if search_btn:
                     "photo_url": None
                 })
 
-            fetch_photos_for_top_places(normalized, top_n=8)
+            prefetch_photos(normalized, top_n=8)
             st.session_state.last_search_results = normalized
+            st.session_state.last_added = None
+            st.session_state.itinerary = None
 
 
 # -------------------------------------------------------
@@ -114,6 +223,7 @@ if st.session_state.last_search_results:
     st.subheader("Step 2: Select Places")
 
     places = st.session_state.last_search_results
+    collect_prefetched_photos(places)
     cols = st.columns(3)
 
     for idx, place in enumerate(places):
@@ -133,8 +243,14 @@ if st.session_state.last_search_results:
 
                 if st.button("Select", key=place["fsq_place_id"]):
                     st.session_state.selected_places.append(place)
+                    st.session_state.last_added = place["fsq_place_id"]
+
+                if st.session_state.last_added == place["fsq_place_id"]:
                     st.success(f"Added {place['name']}")
 
+    if st.session_state.photo_futures:
+        photo_prefetch_poller()
+
     if st.session_state.selected_places:
         st.markdown("### Selected Places:")
         for p in st.session_state.selected_places:
@@ -148,16 +264,59 @@ if st.session_state.selected_places:
     st.subheader("Step 3: Generate Itinerary")
 
     if st.button("Generate Journey"):
-        lat, lon = geocode_address(address)
+        lat, lon = st.session_state.start_coords or cached_geocode(address)
+
+        selected = st.session_state.selected_places
+
+        # top up missing photos in the background while the planner runs:
+        # reuse prefetches still in flight, request only the rest
+        prefetched = st.session_state.photo_futures
+        executor = get_photo_executor()
+        photos = {}
+        for p in selected:
+            pid = p["fsq_place_id"]
+            if p.get("photo_url") or pid in photos:
+                continue
+            photos[pid] = prefetched.get(pid) or executor.submit(cached_photo, pid)
 
         itinerary = generate_itinerary_from_selected(
-            st.session_state.selected_places,
+            selected,
             lat,
             lon,
             budget,
             people
         )
 
+        # join before rendering
+        photo_urls = {pid: f.result() for pid, f in photos.items()}
+        for p in selected:
+            if p["fsq_place_id"] in photo_urls:
+                p["photo_url"] = photo_urls[p["fsq_place_id"]]
+        for pid in photo_urls:
+            prefetched.pop(pid, None)
+
+        for step in itinerary:
+            step["photo_url"] = step["photo_url"] or photo_urls.get(step["fsq_place_id"])
+
+        st.session_state.itinerary = itinerary
+        st.session_state.ai_summary = None
+
+        if itinerary and ai_client:
+            summary = ai_client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": "Summarize this itinerary: " +
+                                    ", ".join([i["name"] for i in itinerary])
+                    }
+                ]
+            )
+            st.session_state.ai_summary = summary.choices[0].message["content"]
+
+    itinerary = st.session_state.itinerary
+
+    if itinerary is not None:
         if not itinerary:
             st.error("Couldn't generate itinerary — try selecting more places.")
         else:
@@ -173,16 +332,6 @@ if st.session_state.selected_places:
                 if step.get("photo_url"):
                     st.image(step["photo_url"], width=400)
 
-            if ai_client:
+            if st.session_state.ai_summary:
                 st.subheader("🧠 AI Summary")
-                summary = ai_client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": "Summarize this itinerary: " +
-                                        ", ".join([i["name"] for i in itinerary])
-                        }
-                    ]
-                )
-                st.write(summary.choices[0].message["content"])
+                st.write(st.session_state.ai_summary)
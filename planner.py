@@ -13,59 +13,101 @@ Returns:
 - A clean ordered itinerary list
 """
 
-from geopy.distance import geodesic
+import re
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+AVG_SPEED_KMPH = 20  # average Pune city speed
 
 
 # -----------------------------------------
 # Distance + Travel Time
 # -----------------------------------------
+def haversine(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; accepts scalars or NumPy arrays (broadcasts)."""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = np.radians(np.subtract(lon2, lon1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
 def distance_km(lat1, lon1, lat2, lon2):
-    return geodesic((lat1, lon1), (lat2, lon2)).km
+    return float(haversine(lat1, lon1, lat2, lon2))
 
 
-def travel_time_min(lat1, lon1, lat2, lon2, speed=20):
+def travel_time_min(lat1, lon1, lat2, lon2, speed=AVG_SPEED_KMPH):
     """Approx travel time at average Pune city speed."""
     dist = distance_km(lat1, lon1, lat2, lon2)
     return (dist / speed) * 60
 
 
+# -----------------------------------------
+# Columnar (SoA) view of the selected places
+# -----------------------------------------
+# map FSQ price tier to approximate INR cost per person
+# price_tier: 1 = cheap, 2 = moderate, 3 = costly, 4 = expensive
+# (slot 0 = unknown tier -> moderate)
+TIER_COST = np.array([400, 200, 400, 800, 1200], dtype=np.float64)
+
+
+def places_to_columns(places):
+    """Pack the per-place numeric fields into parallel NumPy arrays."""
+    n = len(places)
+    tiers = (p.get("price_tier") for p in places)
+
+    cols = {
+        "lat": np.fromiter((p["lat"] for p in places), dtype=np.float64, count=n),
+        "lon": np.fromiter((p["lon"] for p in places), dtype=np.float64, count=n),
+        "tier": np.fromiter(
+            (t if t in (1, 2, 3, 4) else 0 for t in tiers), dtype=np.int8, count=n
+        ),
+        "pop": np.fromiter(
+            (p.get("popularity", 0.6) for p in places), dtype=np.float32, count=n
+        ),
+        "flags": np.fromiter(
+            (_place_flags(p) for p in places), dtype=np.uint16, count=n
+        ),
+    }
+    cols["duration"] = DUR_TABLE[cols["flags"]]  # one NumPy gather
+    return cols
+
+
 # -----------------------------------------
 # Scoring Function
 # -----------------------------------------
-def compute_score(place, budget_per_person, travel_min):
+W_POPULARITY = 0.5
+W_COST = 0.3
+W_TRAVEL = 0.2
+TRAVEL_NORM_MIN = 30  # travel minutes that cost one full penalty unit
+
+
+def compute_scores(cols, budget_per_person, travel_min):
     """
-    Score based on:
+    Vectorized score for every place, based on:
     - popularity
     - cost alignment to budget
     - travel time penalty
-    """
-
-    popularity = place.get("popularity", 0.6)
 
-    # price_tier: 1 = cheap, 2 = moderate, 3 = costly, 4 = expensive
-    price_tier = place.get("price_tier", 2)
+    Returns (scores, approx_cost_pp) arrays.
+    """
 
-    # map FSQ price tier to approximate INR cost per person
-    approx_cost = {
-        1: 200,
-        2: 400,
-        3: 800,
-        4: 1200
-    }.get(price_tier, 400)
+    approx_cost = TIER_COST[cols["tier"]]
 
     # how well the place fits within budget
-    cost_factor = max(0, (budget_per_person - approx_cost) / max(1, budget_per_person))
+    cost_factor = np.maximum(0, (budget_per_person - approx_cost) / max(1, budget_per_person))
 
     # travel time penalty (more time = lower score)
-    travel_penalty = travel_min / 30  # normalized approx
+    travel_penalty = travel_min / TRAVEL_NORM_MIN  # normalized approx
 
-    score = (
-        0.5 * popularity +
-        0.3 * cost_factor -
-        0.2 * travel_penalty
+    scores = (
+        W_POPULARITY * cols["pop"] +
+        W_COST * cost_factor -
+        W_TRAVEL * travel_penalty
     )
 
-    return score, approx_cost
+    return scores, approx_cost
 
 
 # -----------------------------------------
@@ -83,89 +125,162 @@ def generate_itinerary_from_selected(selected_places, start_lat, start_lon, tota
         return []
 
     # -----------------------------------------
-    # 1) Precompute travel time + score for each selected place
+    # 1) Precompute travel times + travel-free score for each selected place
     # -----------------------------------------
 
     budget_per_person = total_budget / max(1, people)
+    cols = places_to_columns(selected_places)
+    lats, lons = cols["lat"], cols["lon"]
+    n = len(selected_places)
+
+    # (n+1) x n travel matrix in minutes, computed once:
+    # row i = from place i, last row (index n) = from the start address
+    from_lats = np.append(lats, start_lat)
+    from_lons = np.append(lons, start_lon)
+    travel = (
+        haversine(from_lats[:, None], from_lons[:, None], lats[None, :], lons[None, :])
+        / AVG_SPEED_KMPH * 60
+    )
 
-    enriched = []
-    for p in selected_places:
+    # travel penalty depends on where we are, so the kernel adds it per step
+    base_scores, approx_cost_pp = compute_scores(cols, budget_per_person, 0.0)
+    total_costs = approx_cost_pp * people
 
-        plat, plon = p["lat"], p["lon"]
+    # -----------------------------------------
+    # 2) Greedy itinerary building
+    # -----------------------------------------
+    MAX_MINUTES = 8 * 60  # 8 hours trip
 
-        travel_min = travel_time_min(start_lat, start_lon, plat, plon)
-        score, approx_cost_pp = compute_score(p, budget_per_person, travel_min)
+    stops = _greedy_plan(
+        base_scores, W_TRAVEL / TRAVEL_NORM_MIN, travel,
+        total_costs, cols["duration"], total_budget, MAX_MINUTES
+    )
 
-        enriched.append({
-            **p,
-            "travel_from_start": travel_min,
-            "score": score,
-            "approx_cost_pp": approx_cost_pp
+    itinerary = []
+    for i, travel_min in stops:
+        p = selected_places[i]
+        itinerary.append({
+            "fsq_place_id": p.get("fsq_place_id"),
+            "name": p["name"],
+            "categories": p.get("categories", []),
+            "photo_url": p.get("photo_url"),
+            "cost": int(total_costs[i]),
+            "travel_time": travel_min,
+            "duration": int(cols["duration"][i]),
+            "lat": p["lat"],
+            "lon": p["lon"]
         })
 
-    # Sort by score (best first)
-    enriched.sort(key=lambda x: x["score"], reverse=True)
+    return itinerary
 
-    # -----------------------------------------
-    # 2) Greedy itinerary building
-    # -----------------------------------------
-    itinerary = []
+
+# -----------------------------------------
+# Greedy kernel
+# -----------------------------------------
+def _greedy_plan(base_scores, travel_weight, travel,
+                 total_costs, durations, total_budget, max_minutes):
+    """
+    At each step rescore every unvisited place against the *current* stop
+    (base score - travel penalty from here) and take the argmax, if it
+    still fits budget + time. Each step is one vectorized pass over the arrays.
+
+    travel: (n+1) x n minutes; row n is the start address.
+    Returns the stops in visiting order as [(place_index, travel_min), ...].
+    """
+    n = len(base_scores)
+    stops = []
+
+    alive = np.ones(n, dtype=bool)  # not yet visited or ruled out
     remaining_budget = total_budget
-    current_lat, current_lon = start_lat, start_lon
+    current_idx = n  # start address row
     total_minutes_used = 0
-    MAX_MINUTES = 8 * 60  # 8 hours trip
 
-    for p in enriched:
+    # floors: nothing costs less / takes less time than these
+    min_cost = total_costs.min()
+    min_step = durations.min()
+
+    for _ in range(n):
+        scores = np.where(alive, base_scores - travel_weight * travel[current_idx], -np.inf)
+        i = int(np.argmax(scores))  # ties -> lowest index (selection order)
+        if not alive[i]:
+            break
+        alive[i] = False
+
         # cost per person * people
-        total_cost = p["approx_cost_pp"] * people
+        total_cost = total_costs[i]
         if total_cost > remaining_budget:
             continue
 
-        travel_min = travel_time_min(current_lat, current_lon, p["lat"], p["lon"])
-
-        visit_duration = estimate_visit_duration(p)
+        travel_min = float(travel[current_idx, i])
 
         # time check
-        if total_minutes_used + travel_min + visit_duration > MAX_MINUTES:
+        if total_minutes_used + travel_min + durations[i] > max_minutes:
             continue
 
-        # add to itinerary
-        itinerary.append({
-            "name": p["name"],
-            "categories": p.get("categories", []),
-            "photo_url": p.get("photo_url"),
-            "cost": total_cost,
-            "travel_time": travel_min,
-            "duration": visit_duration,
-            "lat": p["lat"],
-            "lon": p["lon"]
-        })
+        stops.append((i, travel_min))
 
         # update state
         remaining_budget -= total_cost
-        total_minutes_used += travel_min + visit_duration
-        current_lat, current_lon = p["lat"], p["lon"]  # move to next start
+        total_minutes_used += travel_min + durations[i]
+        current_idx = i  # move to next start
 
-    return itinerary
+        # budget or time exhausted -> no remaining place can fit
+        if remaining_budget < min_cost or total_minutes_used + min_step > max_minutes:
+            break
+
+    return stops
 
 
 # -----------------------------------------
 # Visit Duration Estimate (By Category)
 # -----------------------------------------
+# keyword -> minutes, in priority order (first keyword present wins)
+VISIT_DURATIONS = {
+    "park": 60,
+    "garden": 60,
+    "cafe": 45,
+    "restaurant": 75,
+    "mall": 120,
+    "museum": 60,
+    "adventure": 90,
+    "amusement": 90,
+}
+DEFAULT_VISIT_MIN = 45
+DUR_RX = re.compile("|".join(VISIT_DURATIONS), re.I)
+
+# one bit per keyword, bit 0 = highest priority
+CATEGORY_BITS = {kw: 1 << b for b, kw in enumerate(VISIT_DURATIONS)}
+
+
+def _duration_for_flags(flags):
+    """Minutes for the highest-priority (lowest) set bit, or the default."""
+    if not flags:
+        return DEFAULT_VISIT_MIN
+    lowest_bit = (flags & -flags).bit_length() - 1
+    return list(VISIT_DURATIONS.values())[lowest_bit]
+
+
+# every flag combination -> minutes, so a duration is a single table lookup
+DUR_TABLE = np.array(
+    [_duration_for_flags(f) for f in range(1 << len(VISIT_DURATIONS))], dtype=np.int32
+)
+
+
+def category_flags(categories):
+    """Tokenize category names once into a keyword bitset (see CATEGORY_BITS)."""
+    flags = 0
+    for m in DUR_RX.findall("\n".join(categories)):
+        flags |= CATEGORY_BITS[m.lower()]
+    return flags
+
+
+def _place_flags(place):
+    flags = place.get("category_flags")
+    if flags is None:
+        flags = category_flags(place.get("categories", []))
+    return flags
+
+
 def estimate_visit_duration(place):
-    cats = [c.lower() for c in place.get("categories", [])]
-
-    if any("park" in c or "garden" in c for c in cats):
-        return 60
-    if any("cafe" in c for c in cats):
-        return 45
-    if any("restaurant" in c for c in cats):
-        return 75
-    if any("mall" in c for c in cats):
-        return 120
-    if any("museum" in c for c in cats):
-        return 60
-    if any("adventure" in c or "amusement" in c for c in cats):
-        return 90
-
-    return 45  # default
+    # precomputed at normalization time when available
+    return int(DUR_TABLE[_place_flags(place)])
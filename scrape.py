@@ -7,16 +7,16 @@ ALL PUNE OSM SCRAPER (FINAL FIXED VERSION)
 ✔ Uses reliable area-based query (NEVER returns empty)
 ✔ Normalizes into structured output
 ✔ Exports:
-    - pune_raw_all.json  : all named POIs
-    - pune_clean.json    : filtered + useful POIs for your app
+    - pune_raw_all.json  : all named POIs (compact JSON)
+    - pune_clean.jsonl   : filtered + useful POIs for your app (one per line)
 ------------------------------------------
 Run:
-    pip install requests pandas tqdm
+    pip install requests pandas tqdm orjson
     python all_pune_scrape.py
 """
 
 import requests
-import json
+import orjson
 import pandas as pd
 from tqdm import tqdm
 
@@ -40,52 +40,48 @@ out center;
 """
 
 # ---------------------------------------------
-# CATEGORY MAPPING
+# CLASSIFICATION: category + price tier + popularity
+# (one lookup per tag key, one lowercased name)
 # ---------------------------------------------
-def map_category(tags):
-    if not tags:
-        return "other"
+def classify(tags, name_lc):
+    """
+    name_lc: already-lowercased POI name.
+    Returns (category, price_tier, popularity).
+    """
+    amenity = tags.get("amenity")
+    has_tourism = "tourism" in tags
 
-    for k in ["amenity", "tourism", "shop", "leisure"]:
+    # category: first of these keys present, else fallback
+    category = "other"
+    for k in ("amenity", "tourism", "shop", "leisure"):
         if k in tags:
-            return tags[k]
-
-    # fallback
-    return "other"
-
-
-# ---------------------------------------------
-# PRICE TIER HEURISTIC
-# ---------------------------------------------
-def price_tier(tags, name):
-    name = name.lower()
-
-    if "dhaba" in name or "fast" in name or "stall" in name:
-        return 1
-    if "cafe" in name or "bakery" in name:
-        return 2
-    if "restaurant" in (tags.get("amenity") or ""):
-        return 2
-    if "bar" in name or "pub" in name:
-        return 3
-    if "fine" in name or "premium" in name:
-        return 4
-
-    return 2
-
-
-# ---------------------------------------------
-# POPULARITY HEURISTIC
-# ---------------------------------------------
-def popularity(tags):
+            category = tags[k]
+            break
+
+    # price tier heuristic
+    if "dhaba" in name_lc or "fast" in name_lc or "stall" in name_lc:
+        tier = 1
+    elif "cafe" in name_lc or "bakery" in name_lc:
+        tier = 2
+    elif "restaurant" in (amenity or ""):
+        tier = 2
+    elif "bar" in name_lc or "pub" in name_lc:
+        tier = 3
+    elif "fine" in name_lc or "premium" in name_lc:
+        tier = 4
+    else:
+        tier = 2
+
+    # popularity heuristic
     score = 0.4
     if "wikidata" in tags:
         score += 0.3
-    if "tourism" in tags:
+    if has_tourism:
         score += 0.2
-    if tags.get("amenity") in ["restaurant", "cafe", "bar"]:
+    if amenity in ("restaurant", "cafe", "bar"):
         score += 0.1
-    return min(score, 1.0)
+
+    return category, tier, min(score, 1.0)
 
 
 # ---------------------------------------------
@@ -119,6 +115,39 @@ def fetch_osm():
 # ---------------------------------------------
 # NORMALIZATION
 # ---------------------------------------------
+def _norm_one(e):
+    """
+    Normalize a single OSM element.
+    Returns (dedup_key, record), or None for unusable elements.
+    """
+    tags = e.get("tags", {})
+    name = tags.get("name")
+
+    if not name:  # should not happen due to [name] filter
+        return None
+
+    lat, lon = extract_center(e)
+    if lat is None:
+        return None
+
+    # tuple of (name, micro-degrees) hashes without building a string
+    name_lc = name.lower()
+    key = (name_lc, round(lat * 1_000_000), round(lon * 1_000_000))
+
+    category, tier, pop = classify(tags, name_lc)
+
+    return key, {
+        "name": name,
+        "lat": lat,
+        "lon": lon,
+        "category": category,
+        "price_tier": tier,
+        "popularity": pop,
+        "tags": tags,
+        "photo_url": None,
+    }
+
+
 def normalize(elements):
     results = []
     seen = set()
@@ -126,31 +155,16 @@ def normalize(elements):
     print("🔄 Normalizing results…")
 
     for e in tqdm(elements):
-        tags = e.get("tags", {})
-        name = tags.get("name")
-
-        if not name:  # should not happen due to [name] filter
-            continue
-
-        lat, lon = extract_center(e)
-        if lat is None:
+        r = _norm_one(e)
+        if r is None:
             continue
 
-        key = f"{name.lower()}::{round(lat, 6)}::{round(lon,6)}"
+        key, rec = r
         if key in seen:
             continue
         seen.add(key)
 
-        results.append({
-            "name": name,
-            "lat": lat,
-            "lon": lon,
-            "category": map_category(tags),
-            "price_tier": price_tier(tags, name),
-            "popularity": popularity(tags),
-            "tags": tags,
-            "photo_url": None,
-        })
+        results.append(rec)
 
     return results
 
@@ -158,22 +172,17 @@ def normalize(elements):
 # ---------------------------------------------
 # FILTER CLEAN POIs FOR YOUR APP
 # ---------------------------------------------
-USEFUL = [
+USEFUL = frozenset({
     "restaurant", "cafe", "fast_food",
     "bar", "pub", "food_court",
     "cinema", "theatre",
     "mall", "supermarket", "department_store",
     "park", "garden",
     "viewpoint", "attraction", "museum",
-]
+})
 
 def clean_pois(all_pois):
-    filtered = []
-    for p in all_pois:
-        cat = p["category"]
-        if any(cat == u for u in USEFUL):
-            filtered.append(p)
-    return filtered
+    return [p for p in all_pois if p["category"] in USEFUL]
 
 
 # ---------------------------------------------
@@ -190,15 +199,16 @@ def main():
     print("✨ Useful POIs for app:", len(cleaned))
 
     # Save outputs
-    with open("pune_raw_all.json", "w") as f:
-        json.dump(normalized, f, indent=2)
+    # orjson (C) instead of json.dump(indent=2); JSONL so readers can stream
+    with open("pune_raw_all.json", "wb") as f:
+        f.write(orjson.dumps(normalized))
 
-    with open("pune_clean.json", "w") as f:
-        json.dump(cleaned, f, indent=2)
+    with open("pune_clean.jsonl", "wb") as f:
+        f.writelines(orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE) for r in cleaned)
 
     print("\n🎉 DONE!")
     print("➡ pune_raw_all.json  (ALL named POIs)")
-    print("➡ pune_clean.json    (filtered useful POIs)")
+    print("➡ pune_clean.jsonl   (filtered useful POIs)")
 
 
 if __name__ == "__main__":